@@ -14,12 +14,76 @@ Date: December 2023
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+import functools
+import math
 import time
 import platform
 import os
+import subprocess
 from datetime import datetime, timedelta
 import json
 
+# Prefer orjson (C extension) for settings IO, falling back to stdlib json
+try:
+    import orjson
+    _loads = orjson.loads
+    def _dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    _loads = json.loads
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+
+# Evaluated once at import; platform.system() walks uname on every call
+_IS_MACOS = platform.system() == 'Darwin'
+
+# Platform-invariant parts of the button styling, shared by all buttons
+_MAC_BTN_STYLE = {
+    'bg': '#FFFFFF',
+    'activebackground': '#F0F0F0',
+    'bd': 2,
+    'relief': 'raised'
+}
+_PC_BTN_STYLE = {
+    'fg': 'white',
+    'relief': 'solid'
+}
+
+def _button_kwargs(text, color, font, **extra):
+    common = {'text': text, 'font': font, **extra}
+    if _IS_MACOS:
+        # macOS specific style
+        return {
+            **_MAC_BTN_STYLE, **common,
+            'fg': color,
+            'activeforeground': color
+        }
+    # Windows/Linux style
+    return {
+        **_PC_BTN_STYLE, **common,
+        'bg': color,
+        'highlightbackground': color,
+        'highlightcolor': color
+    }
+
+# (command attribute name, ready-to-splat Button kwargs), merged once at import
+_BUTTON_SPECS = tuple(
+    (cmd_attr, _button_kwargs(text, color, ("SF Pro Display", 14, "bold"), width=8))
+    for text, cmd_attr, color in (
+        ("START", 'start_timer', '#45B7D1'),
+        ("BREAK", 'start_break', '#4CAF50'),
+        ("RESET", 'reset_timer', '#FF6B6B')
+    )
+)
+
+_OK_BTN_KWARGS = _button_kwargs("OK", '#45B7D1', ("SF Pro Display", 13, "bold"))
+
+@functools.lru_cache(maxsize=4)
+def _read_settings_file(path, mtime):
+    # Keyed on mtime so on-disk edits still invalidate the cached parse.
+    with open(path, 'rb') as f:
+        return _loads(f.read())
+
 class PomodoroConfig:
     DEFAULT_SETTINGS = {
         'work_time': 25,
@@ -32,31 +96,50 @@ class PomodoroConfig:
     
     def __init__(self):
         self.settings = self.load_settings()
-        
+        self._dirty = False
+
+    def set(self, key, value):
+        # Mutations go through here so save_settings can skip clean saves
+        if self.settings.get(key) != value:
+            self.settings[key] = value
+            self._dirty = True
+
+
     def load_settings(self):
+        path = 'pomodoro_settings.json'
         try:
-            with open('pomodoro_settings.json', 'r') as f:
-                return {**self.DEFAULT_SETTINGS, **json.load(f)}
+            mtime = os.stat(path).st_mtime
         except FileNotFoundError:
             return self.DEFAULT_SETTINGS.copy()
-            
+        return {**self.DEFAULT_SETTINGS, **_read_settings_file(path, mtime)}
+
     def save_settings(self):
-        with open('pomodoro_settings.json', 'w') as f:
-            json.dump(self.settings, f)
+        if not self._dirty:
+            return
+        # Write to a temp file and rename so a crash mid-write can't
+        # leave a truncated settings file behind
+        path = 'pomodoro_settings.json'
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(_dumps(self.settings))
+        os.replace(tmp, path)
+        _read_settings_file.cache_clear()
+        self._dirty = False
 
 class PomodoroStats:
     def __init__(self):
         self.completed_pomodoros = 0
-        self.total_focus_time = 0
+        self.total_focus_time = 0  # whole seconds; avoids float accumulation drift
         self.start_time = None
         
     def start_session(self):
-        self.start_time = time.time()
-        
+        # monotonic() is immune to NTP/DST wall-clock jumps, so session
+        # durations can never come out negative or wildly wrong.
+        self.start_time = time.monotonic()
+
     def end_session(self):
         if self.start_time:
-            session_duration = time.time() - self.start_time
-            self.total_focus_time += session_duration
+            self.total_focus_time += int(time.monotonic() - self.start_time)
             self.completed_pomodoros += 1
             self.start_time = None
 
@@ -65,28 +148,51 @@ class PomodoroTimer:
         self.master = master
         self.config = PomodoroConfig()
         self.stats = PomodoroStats()
-        
+
+        # Resolve the notification player once; None disables sound playback
+        afplay = '/usr/bin/afplay'
+        self._afplay_path = afplay if _IS_MACOS and os.path.exists(afplay) else None
+
+
         self._setup_ui()
         self._setup_variables()
         
     def _setup_variables(self):
         self.remaining_time = self.config.settings['work_time'] * 60
+        self._total_time = self.remaining_time
+        self._progress_scale = 100.0 / self._total_time
         self.running = False
         self.is_break = False
         self.sessions_completed = 0
-        self.last_tick = None
-        
+        self.end_time = None
+        self._last_displayed = None
+        self._last_text = None
+        self._last_progress = -1
+        self._last_stats_text = ''
+        self._stats_pending = False
+
     def _setup_ui(self):
+        # Keep the window hidden while widgets are packed so Tk does one
+        # layout pass and one paint instead of one per widget
+        self.master.withdraw()
+
         self.master.title("Focus Timer - For your paper")
         self.master.geometry("500x500")
         self.master.configure(bg='#FFF5E1')
         self.master.attributes('-topmost', True)
-        
+        # Tracks the -topmost state so it's only re-sent when it changes;
+        # each attributes() call is a wm round-trip
+        self._topmost = True
+
         self._create_header()
         self._create_timer_display()
         self._create_progress_bar()
         self._create_controls()
         self._create_stats_display()
+        self._create_message_window()
+
+        self.master.update_idletasks()
+        self.master.deiconify()
         
     def _create_header(self):
         header_frame = tk.Frame(self.master, bg='#FFF5E1')
@@ -126,46 +232,13 @@ class PomodoroTimer:
         control_frame = tk.Frame(self.master, bg='#FFF5E1')
         control_frame.pack(pady=20)
         
-        buttons = [
-            ("START", self.start_timer, '#45B7D1'),
-            ("BREAK", self.start_break, '#4CAF50'),
-            ("RESET", self.reset_timer, '#FF6B6B')
-        ]
-        
-        # Check if running on macOS
-        is_macos = platform.system() == 'Darwin'
-        
-        for text, command, color in buttons:
-            button_style = {
-                'text': text,
-                'command': command,
-                'font': ("SF Pro Display", 14, "bold"),
-                'width': 8
-            }
-            
-            if is_macos:
-                # macOS specific style
-                button_style.update({
-                    'bg': '#FFFFFF',
-                    'fg': color,
-                    'activebackground': '#F0F0F0',
-                    'activeforeground': color,
-                    'bd': 2,
-                    'relief': 'raised'
-                })
-            else:
-                # Windows/Linux style
-                button_style.update({
-                    'bg': color,
-                    'fg': 'white',
-                    'relief': 'solid',
-                    'highlightbackground': color,
-                    'highlightcolor': color
-                })
-            
-            btn = tk.Button(control_frame, **button_style)
+        for cmd_attr, kwargs in _BUTTON_SPECS:
+            btn = self._make_button(control_frame, getattr(self, cmd_attr), kwargs)
             btn.pack(side=tk.LEFT, padx=10)
             
+    def _make_button(self, parent, command, kwargs):
+        return tk.Button(parent, command=command, **kwargs)
+
     def _create_stats_display(self):
         stats_frame = tk.Frame(self.master, bg='#FFF5E1')
         stats_frame.pack(pady=20, fill=tk.X, padx=20)
@@ -180,41 +253,60 @@ class PomodoroTimer:
         )
         self.stats_label.pack(anchor=tk.W)
         
+    def _schedule_stats_update(self):
+        # Defer the label rebuild to idle time and coalesce bursts of
+        # near-simultaneous updates into a single repaint
+        if not self._stats_pending:
+            self._stats_pending = True
+            self.master.after_idle(self._flush_stats)
+
+    def _flush_stats(self):
+        self._stats_pending = False
+        self.update_stats_display()
+
     def update_stats_display(self):
-        total_minutes = int(self.stats.total_focus_time / 60)
-        self.stats_label.config(
-            text=f"today focus: {self.stats.completed_pomodoros} tomatoes\n"
-                f"total focus: {total_minutes} mins"
-        )
+        total_minutes = self.stats.total_focus_time // 60
+        text = (f"today focus: {self.stats.completed_pomodoros} tomatoes\n"
+                f"total focus: {total_minutes} mins")
+        if text != self._last_stats_text:
+            self.stats_label.config(text=text)
+            self._last_stats_text = text
         
     def countdown(self):
         if not self.running:
             return
-            
-        current_time = time.time()
-        if self.last_tick:
-            self.remaining_time -= int(current_time - self.last_tick)
-        self.last_tick = current_time
-        
-        if self.remaining_time <= 0:
+
+        remaining = self.end_time - time.monotonic()
+        if remaining <= 0:
             self.timer_complete()
             return
-            
-        minutes, seconds = divmod(self.remaining_time, 60)
-        self.timer_label.config(text=f"{minutes:02d}:{seconds:02d}")
-        
-        # Update progress bar
-        total_time = (self.config.settings['break_time'] if self.is_break else self.config.settings['work_time']) * 60
-        progress = ((total_time - self.remaining_time) / total_time) * 100
-        self.progress_var.set(progress)
-        
-        self.master.after(1000, self.countdown)
+
+        secs_left = math.ceil(remaining)
+        if secs_left != self._last_displayed:
+            self._last_displayed = secs_left
+            self.remaining_time = secs_left
+
+            minutes = secs_left // 60
+            seconds = secs_left - minutes * 60
+            text = "%02d:%02d" % (minutes, seconds)
+            if text != self._last_text:
+                self.timer_label.config(text=text)
+                self._last_text = text
+
+            # Update progress bar, quantized to whole percent
+            pct = int((self._total_time - secs_left) * self._progress_scale)
+            if pct != self._last_progress:
+                self.progress_var.set(pct)
+                self._last_progress = pct
+
+        # Wake up just past the next whole-second boundary of the deadline
+        self.master.after(int((remaining - math.floor(remaining)) * 1000) + 1, self.countdown)
         
     def timer_complete(self):
         if not self.is_break:
             self.sessions_completed += 1
             self.stats.end_session()
-            self.update_stats_display()
+            self._schedule_stats_update()
             
         self.play_notification()
         self.show_completion_message()
@@ -230,19 +322,22 @@ class PomodoroTimer:
             
     def start_timer(self):
         if self.running:
-            self.reset_timer()
-        
+            self._stop_timer()
+
         self.running = True
         self.is_break = False
         self.remaining_time = self.config.settings['work_time'] * 60
-        self.last_tick = time.time()
+        self._total_time = self.remaining_time
+        self._progress_scale = 100.0 / self._total_time
+        self.end_time = time.monotonic() + self.remaining_time
+        self._last_displayed = None
         self.stats.start_session()
         self.countdown()
         
     def start_break(self):
         if self.running:
-            self.reset_timer()
-            
+            self._stop_timer()
+
         self.running = True
         self.is_break = True
         
@@ -252,72 +347,72 @@ class PomodoroTimer:
             self.sessions_completed = 0
         else:
             self.remaining_time = self.config.settings['break_time'] * 60
-            
-        self.last_tick = time.time()
+
+        self._total_time = self.remaining_time
+        self._progress_scale = 100.0 / self._total_time
+        self.end_time = time.monotonic() + self.remaining_time
+        self._last_displayed = None
         self.countdown()
         
-    def reset_timer(self):
+    def _stop_timer(self):
+        # Stop the countdown without touching the UI; restart paths
+        # overwrite the display anyway, so resetting it first would just
+        # issue wasted Tcl round-trips.
         self.running = False
+        self.end_time = None
+
+    def reset_timer(self):
+        self._stop_timer()
         self.is_break = False
         self.remaining_time = self.config.settings['work_time'] * 60
-        self.last_tick = None
+        self._last_displayed = None
+        self._last_text = None
+        self._last_progress = -1
         self.progress_var.set(0)
         minutes = self.config.settings['work_time']
         self.timer_label.config(text=f"{minutes:02d}:00")
         
     def play_notification(self):
-        if self.config.settings['sound_enabled']:
-            if platform.system() == 'Darwin':
-                os.system('afplay /System/Library/Sounds/Glass.aiff')
+        if self.config.settings['sound_enabled'] and self._afplay_path:
+            # Fire-and-forget so the sound never blocks the Tk main loop
+            subprocess.Popen(
+                [self._afplay_path, '/System/Library/Sounds/Glass.aiff'],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                close_fds=True
+            )
                 
-    def show_completion_message(self):
-        self.master.lift()
-        self.master.attributes('-topmost', True)
-        
-        msg_window = tk.Toplevel(self.master)
-        msg_window.title("Pomodoro Timer")
-        msg_window.geometry("300x150")
-        msg_window.configure(bg='#FFF5E1')
-        msg_window.attributes('-topmost', True)
-        
-        message = "It's time to take a break!" if not self.is_break else "It's time to focus!"
-        
-        msg_label = tk.Label(
-            msg_window,
-            text=message,
+    def _create_message_window(self):
+        # Built once and hidden; widget creation/destruction per
+        # completion is expensive and a known tkinter leak surface
+        self._msg_window = tk.Toplevel(self.master)
+        self._msg_window.title("Pomodoro Timer")
+        self._msg_window.geometry("300x150")
+        self._msg_window.configure(bg='#FFF5E1')
+        self._msg_window.attributes('-topmost', True)
+        self._msg_window.protocol('WM_DELETE_WINDOW', self._msg_window.withdraw)
+        self._msg_window.withdraw()
+
+        self._msg_label = tk.Label(
+            self._msg_window,
+            text="",
             font=("SF Pro Display", 16),
             bg='#FFF5E1',
             wraplength=250
         )
-        msg_label.pack(pady=20)
-        
-        # Check if running on macOS for OK button style
-        is_macos = platform.system() == 'Darwin'
-        button_style = {
-            'text': "OK",
-            'command': msg_window.destroy,
-            'font': ("SF Pro Display", 13, "bold")
-        }
-        
-        if is_macos:
-            button_style.update({
-                'bg': '#FFFFFF',
-                'fg': '#45B7D1',
-                'activebackground': '#F0F0F0',
-                'activeforeground': '#45B7D1',
-                'bd': 2,
-                'relief': 'raised'
-            })
-        else:
-            button_style.update({
-                'bg': '#45B7D1',
-                'fg': 'white',
-                'relief': 'solid'
-            })
-        
-        ok_button = tk.Button(msg_window, **button_style)
+        self._msg_label.pack(pady=20)
+
+        ok_button = self._make_button(self._msg_window, self._msg_window.withdraw, _OK_BTN_KWARGS)
         ok_button.pack(pady=10)
 
+    def show_completion_message(self):
+        self.master.lift()
+
+        message = "It's time to take a break!" if not self.is_break else "It's time to focus!"
+        self._msg_label.config(text=message)
+        self._msg_window.deiconify()
+        self._msg_window.lift()
+
 def main():
     root = tk.Tk()
     app = PomodoroTimer(root)